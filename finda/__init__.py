@@ -18,7 +18,7 @@ from .schemas import (
 )
 
 # Config
-from .config import settings, normalize_symbol, get_provider_for_symbol
+from .config import settings, normalize_symbol, get_provider_for_symbol, get_provider_order, get_provider_symbols
 
 # Cache
 from .cache_manager import CacheManager, cache_manager
@@ -31,8 +31,12 @@ from .async_ohlcv import (
     fetch_dukascopy_ohlcv_async,
     fetch_alpaca_ohlcv_async,
     df_to_candles,
+    df_to_candle_records,
+    df_to_candle_columns,
     provider_health,
-    ProviderHealth
+    ProviderHealth,
+    open_async_clients,
+    close_async_clients
 )
 
 from .async_tick import (
@@ -40,7 +44,8 @@ from .async_tick import (
     fetch_dukascopy_tick_async,
     fetch_binance_tick_async,
     fetch_alpaca_tick_async,
-    df_to_ticks
+    df_to_ticks,
+    df_to_tick_records
 )
 
 # Live streaming
@@ -53,14 +58,18 @@ from .live_streamer import (
 
 # Legacy sync fetchers (deprecated but maintained)
 from .ohlcv_fetcher import (
+    OHLCVBatch,
     fetch_unified_ohclv,
+    fetch_unified_ohclv_async,
     fetch_dukascopy_ohclv,
     fetch_binance_ohclv,
     fetch_alpaca_ohclv
 )
 
 from .tick_fetcher import (
+    TickBatch,
     fetch_unified_tick,
+    fetch_unified_tick_async,
     fetch_dukascopy_ticks,
     fetch_binance_ticks,
     fetch_alpaca_ticks
@@ -74,14 +83,25 @@ class Finda:
     
     Example:
         from finda import Finda
-        f = Finda()
-        df = await f.get_candles("EUR/USD", "1m", "2024-01-01", "2024-01-02")
+        async with Finda() as f:  # pools upstream connections until exit
+            df = await f.get_candles("EUR/USD", "1m", "2024-01-01", "2024-01-02")
     """
     
     def __init__(self):
         self.cache = cache_manager
         self.health = provider_health
     
+    async def __aenter__(self):
+        open_async_clients()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    async def close(self):
+        """Close pooled upstream connections."""
+        await close_async_clients()
+    
     async def get_candles(
         self, 
         symbol: str, 
@@ -162,6 +182,10 @@ __all__ = [
     "calculate_notional",
     
     # Legacy sync
+    "OHLCVBatch",
+    "TickBatch",
     "fetch_unified_ohclv",
     "fetch_unified_tick",
+    "fetch_unified_ohclv_async",
+    "fetch_unified_tick_async",
 ]
@@ -4,20 +4,23 @@ High-performance async tick data with Bid/Ask microstructure
 """
 
 import asyncio
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 from typing import List, Optional
 import logging
 
-try:
-    import ccxt.async_support as ccxt_async
-except ImportError:
-    ccxt_async = None
-
 from .schemas import Tick, TickResponse
-from .config import settings, normalize_symbol, logger
+from .config import (
+    settings, normalize_symbol, get_provider_for_symbol, get_provider_order,
+    get_provider_symbols,
+)
 from .cache_manager import cache_manager
-from .async_ohlcv import provider_health
+from .clients import alpaca_client
+from .async_ohlcv import (
+    provider_health, is_upstream_error, get_binance_async, release_binance_async, race_fetches,
+    columns_to_records, float_columns, utc_datetimes,
+)
 
 
 async def fetch_dukascopy_tick_async(
@@ -63,7 +66,8 @@ async def fetch_dukascopy_tick_async(
         return result
     
     except Exception as e:
-        provider_health.mark_unhealthy("dukascopy", str(e))
+        if is_upstream_error(e):
+            provider_health.mark_unhealthy("dukascopy", str(e))
         raise
 
 
@@ -72,27 +76,25 @@ async def fetch_binance_tick_async(
     start: datetime,
     end: datetime
 ) -> pd.DataFrame:
-    """Async Binance trade (tick) fetcher."""
-    if ccxt_async is None:
-        raise ImportError("ccxt.async_support not available")
-    
-    exchange = ccxt_async.binance({"enableRateLimit": True})
+    """
+    Async Binance trade (tick) fetcher.
+
+    `symbol` is taken as a Binance market symbol (e.g. BTCUSDT); direct
+    callers with a unified symbol resolve it via get_provider_symbols().
+    """
+    exchange = get_binance_async()
     
     try:
         import time
         start_time = time.time()
         
-        binance_symbol = symbol.replace("/", "").upper()
-        if "USDT" not in binance_symbol and "USD" in binance_symbol:
-            binance_symbol = binance_symbol.replace("USD", "USDT")
-        
         since_ms = int(start.timestamp() * 1000)
         end_ms = int(end.timestamp() * 1000)
         
         all_trades = []
         
         while since_ms < end_ms:
-            trades = await exchange.fetch_trades(binance_symbol, since=since_ms, limit=1000)
+            trades = await exchange.fetch_trades(symbol, since=since_ms, limit=1000)
             if not trades:
                 break
             
@@ -111,26 +113,29 @@ async def fetch_binance_tick_async(
         if not all_trades:
             return pd.DataFrame()
         
-        # Build DataFrame with bid/ask inferred from trade side
-        rows = []
-        for t in all_trades:
-            side = t.get("side")
-            rows.append({
-                "time": datetime.fromtimestamp(t["timestamp"] / 1000, tz=timezone.utc),
-                "bid": t["price"] if side == "sell" else None,
-                "ask": t["price"] if side == "buy" else None,
-                "bid_volume": t["amount"] if side == "sell" else 0,
-                "ask_volume": t["amount"] if side == "buy" else 0,
-                "volume": t["amount"]
-            })
+        # Bid/ask from trade side; the empty side is NaN (serialized as null)
+        n = len(all_trades)
+        ts_ms = np.fromiter((t["timestamp"] for t in all_trades), dtype=np.int64, count=n)
+        price = np.fromiter((t["price"] for t in all_trades), dtype=np.float64, count=n)
+        amount = np.fromiter((t["amount"] for t in all_trades), dtype=np.float64, count=n)
+        side = np.fromiter((t.get("side") or "" for t in all_trades), dtype="U4", count=n)
+        is_buy, is_sell = side == "buy", side == "sell"
         
-        return pd.DataFrame(rows)
+        return pd.DataFrame({
+            "time": pd.to_datetime(ts_ms, unit="ms", utc=True),
+            "bid": np.where(is_sell, price, np.nan),
+            "ask": np.where(is_buy, price, np.nan),
+            "bid_volume": np.where(is_sell, amount, 0.0),
+            "ask_volume": np.where(is_buy, amount, 0.0),
+            "volume": amount
+        })
     
     except Exception as e:
-        provider_health.mark_unhealthy("binance", str(e))
+        if is_upstream_error(e):
+            provider_health.mark_unhealthy("binance", str(e))
         raise
     finally:
-        await exchange.close()
+        await release_binance_async(exchange)
 
 
 async def fetch_alpaca_tick_async(
@@ -149,7 +154,7 @@ async def fetch_alpaca_tick_async(
         from alpaca.data.historical import StockHistoricalDataClient
         from alpaca.data.requests import StockTradesRequest
         
-        client = StockHistoricalDataClient(settings.alpaca_api_key, settings.alpaca_secret_key)
+        client = alpaca_client(StockHistoricalDataClient, settings.alpaca_api_key, settings.alpaca_secret_key)
         
         request = StockTradesRequest(
             symbol_or_symbols=symbol.upper(),
@@ -189,7 +194,8 @@ async def fetch_alpaca_tick_async(
         return result
     
     except Exception as e:
-        provider_health.mark_unhealthy("alpaca", str(e))
+        if is_upstream_error(e):
+            provider_health.mark_unhealthy("alpaca", str(e))
         raise
 
 
@@ -201,7 +207,7 @@ async def fetch_tick_unified_async(
     use_cache: bool = True
 ) -> tuple[pd.DataFrame, str, bool]:
     """
-    Unified async tick fetcher with smart fallback.
+    Unified async tick fetcher racing all candidate providers.
     
     Returns:
         (DataFrame, provider_name, from_cache)
@@ -220,32 +226,27 @@ async def fetch_tick_unified_async(
     if provider:
         providers = [provider]
     else:
-        from .config import get_provider_for_symbol
+        # Only providers that carry the symbol, primary first
+        eligible = get_provider_order(normalized_symbol)
         primary = get_provider_for_symbol(normalized_symbol)
-        providers = [primary] + [p for p in ["dukascopy", "binance", "alpaca"] if p != primary]
+        providers = [primary] + [p for p in eligible if p != primary]
+        providers = [p for p in providers if p in eligible]
     
-    last_error = None
+    fetchers = {
+        "dukascopy": fetch_dukascopy_tick_async,
+        "binance": fetch_binance_tick_async,
+        "alpaca": fetch_alpaca_tick_async,
+    }
+    symbols = get_provider_symbols(normalized_symbol)
+    df, prov, last_error = await race_fetches({
+        p: fetchers[p](getattr(symbols, p), start, end)
+        for p in providers if p in fetchers
+    }, what="tick fetch")
     
-    for prov in providers:
-        try:
-            if prov == "dukascopy":
-                df = await fetch_dukascopy_tick_async(normalized_symbol, start, end)
-            elif prov == "binance":
-                df = await fetch_binance_tick_async(normalized_symbol, start, end)
-            elif prov == "alpaca":
-                df = await fetch_alpaca_tick_async(normalized_symbol, start, end)
-            else:
-                continue
-            
-            if not df.empty:
-                if use_cache:
-                    cache_manager.save_cache(df, normalized_symbol, "tick", "tick", start, end)
-                return df, prov, False
-        
-        except Exception as e:
-            last_error = e
-            logger.warning(f"{prov} tick fetch failed: {e}")
-            continue
+    if prov is not None:
+        if use_cache:
+            cache_manager.save_cache(df, normalized_symbol, "tick", "tick", start, end)
+        return df, prov, False
     
     if last_error:
         raise last_error
@@ -254,15 +255,15 @@ async def fetch_tick_unified_async(
 
 
 def df_to_ticks(df: pd.DataFrame) -> List[Tick]:
-    """Convert DataFrame to list of Tick models."""
-    ticks = []
-    for _, row in df.iterrows():
-        ticks.append(Tick(
-            time=row["time"],
-            bid=row.get("bid"),
-            ask=row.get("ask"),
-            bid_volume=row.get("bid_volume", 0),
-            ask_volume=row.get("ask_volume", 0),
-            volume=row.get("volume", 0)
-        ))
-    return ticks
+    """Convert DataFrame to list of Tick models (trusted frame, no per-row validation)."""
+    columns = [list(pd.DatetimeIndex(df["time"]).to_pydatetime())] + float_columns(df, TICK_FIELDS[1:])
+    return [Tick.model_construct(**r) for r in columns_to_records(TICK_FIELDS, columns)]
+
+
+TICK_FIELDS = ("time", "bid", "ask", "bid_volume", "ask_volume", "volume")
+
+
+def df_to_tick_records(df: pd.DataFrame) -> List[dict]:
+    """Convert DataFrame to JSON-ready tick dicts, skipping per-row model validation."""
+    columns = [utc_datetimes(df["time"])] + float_columns(df, TICK_FIELDS[1:])
+    return columns_to_records(TICK_FIELDS, columns)
@@ -4,11 +4,14 @@ High-performance Parquet-based caching with smart merging
 """
 
 import pandas as pd
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, Callable, Awaitable, List
+from typing import Any, Optional, Callable, Awaitable, Hashable, List
 import hashlib
 import logging
+import threading
+import time
 
 from .config import settings
 
@@ -27,7 +30,8 @@ class CacheManager:
                       start: datetime, end: datetime) -> Path:
         """Generate cache file path."""
         safe_symbol = symbol.replace("/", "_").replace(" ", "_")
-        date_key = f"{start.strftime('%Y%m%d')}_{end.strftime('%Y%m%d')}"
+        # Second resolution so intraday windows on the same day don't collide
+        date_key = f"{start.strftime('%Y%m%dT%H%M%S')}_{end.strftime('%Y%m%dT%H%M%S')}"
         filename = f"{safe_symbol}_{data_type}_{tf}_{date_key}.parquet"
         return self.cache_dir / filename
     
@@ -68,7 +72,7 @@ class CacheManager:
         cache_path = self.get_cache_key(symbol, data_type, tf, start, end)
         
         try:
-            df.to_parquet(cache_path, index=False)
+            df.to_parquet(cache_path, index=False, compression="zstd")
             logger.debug(f"Cache SAVE: {cache_path.name}")
             return True
         except Exception as e:
@@ -148,5 +152,69 @@ class CacheManager:
         }
 
 
+class MemoryCache:
+    """
+    Thread-safe in-process LRU cache with an optional per-entry TTL.
+
+    Sits in front of the upstream providers for repeated identical
+    requests; entries without a TTL live until evicted by size. With
+    `max_bytes`, values are bytes-like and their total len() is also
+    bounded; a single value over the budget is not stored.
+    """
+    
+    def __init__(self, maxsize: int = 512, max_bytes: Optional[int] = None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Hashable, tuple[Any, Optional[float], int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at, _ = entry
+                if expires_at is None or time.monotonic() < expires_at:
+                    self._data.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return value
+                self._bytes -= self._data.pop(key)[2]
+            self.stats["misses"] += 1
+            return None
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value; `ttl` seconds, or None to keep it until evicted."""
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        size = len(value) if self.max_bytes is not None else 0
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._data[key] = (value, expires_at, size)
+            self._bytes += size
+            while len(self._data) > self.maxsize or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                self._bytes -= self._data.popitem(last=False)[1][2]
+    
+    def clear(self) -> int:
+        """Drop all entries. Returns count of dropped entries."""
+        with self._lock:
+            count = len(self._data)
+            self._data.clear()
+            self._bytes = 0
+        return count
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
 # Global cache manager instance
 cache_manager = CacheManager()
+
+# Global in-process cache for legacy unified fetch results
+memory_cache = MemoryCache(settings.memory_cache_size)
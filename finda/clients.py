@@ -0,0 +1,12 @@
+"""
+Shared upstream clients for finda
+Reused across calls so each keeps its HTTP connections alive
+"""
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=16)
+def alpaca_client(client_cls, api_key: str, secret_key: str):
+    """One Alpaca client (and its requests.Session) per client class and key pair."""
+    return client_cls(api_key, secret_key)
@@ -4,9 +4,11 @@ Reads from environment variables and .env file
 """
 
 from pydantic_settings import BaseSettings
-from typing import Optional
+from functools import lru_cache
+from typing import NamedTuple, Optional
 from pathlib import Path
 import logging
+import re
 
 
 class Settings(BaseSettings):
@@ -20,6 +22,12 @@ class Settings(BaseSettings):
     cache_dir: str = ".finda_cache"
     cache_enabled: bool = True
     cache_ttl_hours: int = 24
+    # In-process cache of unified fetch results (entries, and TTL for open windows)
+    memory_cache_size: int = 512
+    memory_cache_recent_ttl_seconds: int = 30
+    # Serialized API response bodies kept by the server
+    body_cache_size: int = 2048
+    body_cache_max_mb: int = 256
     
     # Logging
     log_level: str = "INFO"
@@ -28,10 +36,15 @@ class Settings(BaseSettings):
     max_parallel_chunks: int = 5
     chunk_size_days: int = 7
     request_timeout_seconds: int = 30
+    # Keep-alive connections per upstream HTTP pool (aiohttp connector, requests adapter)
+    http_pool_size: int = 32
     
     # Provider priorities (fallback order)
     provider_priority: list = ["dukascopy", "binance", "alpaca"]
     
+    # Seconds an unhealthy provider is skipped before it is tried again
+    provider_retry_seconds: int = 30
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -98,5 +111,60 @@ def get_provider_for_symbol(symbol: str) -> str:
     return "alpaca"
 
 
+class ProviderSymbols(NamedTuple):
+    """One symbol spelled the way each provider expects it."""
+    dukascopy: str
+    binance: str
+    alpaca: str
+
+
+@lru_cache(maxsize=1024)
+def get_provider_symbols(symbol: str) -> ProviderSymbols:
+    """Per-provider forms of a symbol, parsed once per distinct input."""
+    normalized = normalize_symbol(symbol)
+    binance = normalized.replace("/", "")
+    if "USDT" not in binance and "USD" in binance:
+        binance = binance.replace("USD", "USDT")
+    return ProviderSymbols(dukascopy=normalized, binance=binance, alpaca=normalized)
+
+
+_FOREX_PAIR = re.compile(r"^([A-Z]{3})/([A-Z]{3})$")
+
+# ISO 4217 fiat and metal codes Dukascopy quotes against each other
+FOREX_CODES = frozenset({
+    "USD", "EUR", "GBP", "JPY", "CHF", "AUD", "CAD", "NZD",
+    "SEK", "NOK", "DKK", "PLN", "HUF", "CZK", "TRY", "ZAR",
+    "MXN", "SGD", "HKD", "CNH", "ILS", "RUB", "THB",
+    "XAU", "XAG", "XPT", "XPD",
+})
+
+# Quote currencies a slashless pair (SOLUSD, DOGEUSDT) can end in
+QUOTE_CODES = FOREX_CODES | {"USDT", "USDC", "BUSD", "DAI"}
+
+
+@lru_cache(maxsize=1024)
+def get_provider_order(symbol: str) -> tuple:
+    """
+    Providers that can serve a symbol, best first.
+    
+    Routing by symbol shape skips upstream calls that can only fail:
+    USDT pairs go to Binance then Alpaca, fiat/metal pairs (EUR/USD, XAU/USD)
+    to Dukascopy, plain stock tickers to Alpaca. Anything else, including
+    crypto quoted in fiat (SOL/USD, SOLUSD), tries every provider.
+    """
+    normalized = normalize_symbol(symbol)
+    is_crypto = any(c in normalized for c in ["BTC", "ETH", "USDT"])
+    pair = _FOREX_PAIR.match(normalized)
+    
+    if normalized.endswith("/USDT"):
+        return ("binance", "alpaca")
+    if pair and FOREX_CODES.issuperset(pair.groups()):
+        return ("dukascopy",)
+    is_pair = any(normalized.endswith(q) and len(normalized) > len(q) for q in QUOTE_CODES)
+    if normalized.isalpha() and not is_crypto and not is_pair:
+        return ("alpaca",)
+    return ("dukascopy", "binance", "alpaca")
+
+
 # Ensure cache directory exists
 Path(settings.cache_dir).mkdir(parents=True, exist_ok=True)
@@ -1,19 +1,67 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import ccxt
+import numpy as np
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timezone
+from dateutil.tz import tzlocal
+from functools import lru_cache, wraps
 import re
+from requests.adapters import HTTPAdapter
+import time
+from typing import NamedTuple
 
+from .async_ohlcv import provider_health, is_upstream_error, page_windows, clip_page
+from .cache_manager import cache_manager, memory_cache
+from .clients import alpaca_client
+from .config import settings, get_provider_order
+
+# Shared client so ccxt's requests.Session keeps connections alive across calls;
+# the pool is sized for concurrent provider/window threads (requests defaults to 10)
+_binance = ccxt.binance({'enableRateLimit': True, 'timeout': settings.request_timeout_seconds * 1000})
+_binance.session.mount('https://', HTTPAdapter(
+    pool_connections=settings.http_pool_size, pool_maxsize=settings.http_pool_size
+))
+
+# Dedicated pool for blocking provider SDK calls, so races don't compete with
+# (or get joined by) the event loop's default executor. Lives for the process.
+provider_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='finda-provider')
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+class ColumnarBatch(NamedTuple):
+    """
+    Columnar fetch result: `data` is a C-contiguous (N, 5) float64 array
+    in the fetcher's column order, `times` the matching DatetimeIndex.
+    """
+    data: np.ndarray
+    times: pd.DatetimeIndex
+
+    def as_lists(self):
+        """Legacy per-column lists followed by the times list."""
+        return (*self.data.T.tolist(), list(self.times.to_pydatetime()))
+
+class OHLCVBatch(ColumnarBatch):
+    """ColumnarBatch ordered as OHLCV_COLUMNS."""
+    __slots__ = ()
+
+# unit+num (e.g. min1) or num+unit (e.g. 1min), tried in that order
+_TF_RE = re.compile(r"([a-zA-Z]+)(\d+)|(\d+)([a-zA-Z]+)")
+
+@lru_cache(maxsize=256)
 def parse_tf(tf):
-    # Try unit+num (e.g. min1)
-    match = re.match(r"([a-zA-Z]+)(\d+)", tf.strip().lower())
-    if match:
+    match = _TF_RE.match(tf.strip().lower())
+    if match is None:
+        return None, None
+    if match.group(1):
         return match.group(1), match.group(2)
-    # Try num+unit (e.g. 1min)
-    match = re.match(r"(\d+)([a-zA-Z]+)", tf.strip().lower())
-    if match:
-        return match.group(2), match.group(1)
-    return None, None
+    return match.group(4), match.group(3)
 
+@lru_cache(maxsize=256)
+def _norm_symbol(s):
+    return s.strip().upper()
+
+@lru_cache(maxsize=256)
 def user_to_dukascopy_tf(tf):
     unit, num = parse_tf(tf)
     units = {
@@ -30,6 +78,7 @@ def user_to_dukascopy_tf(tf):
             if unit.startswith(k): return f"{num}{v}"
     raise ValueError(f"Unrecognized Dukascopy timeframe: '{tf}'")
 
+@lru_cache(maxsize=256)
 def user_to_binance_tf(tf):
     unit, num = parse_tf(tf)
     units = {
@@ -45,6 +94,7 @@ def user_to_binance_tf(tf):
             if unit.startswith(k): return f"{num}{v}"
     raise ValueError(f"Unrecognized Binance timeframe: '{tf}'")
 
+@lru_cache(maxsize=256)
 def user_to_alpaca_tf(tf):
     unit, num = parse_tf(tf)
     units = {
@@ -58,96 +108,269 @@ def user_to_alpaca_tf(tf):
             if unit.startswith(k): return f"{num}{v}"
     raise ValueError(f"Unrecognized Alpaca timeframe: '{tf}'")
 
-def user_to_dt(s, as_type='datetime'):
+def ms_to_local_datetimes(ts_ms):
+    # Same convention as datetime.fromtimestamp(ms / 1000): naive local wall-clock time.
+    # Returned as a DatetimeIndex; no per-row datetime objects are allocated.
+    utc = pd.DatetimeIndex(pd.to_datetime(ts_ms, unit='ms', utc=True))
+    return utc.tz_convert(tzlocal()).tz_localize(None)
+
+@lru_cache(maxsize=1024)
+def _parse_user_dt(s):
     parts = [int(p) for p in s.split('-')]
     while len(parts) < 6: parts.append(0)
-    dt = datetime(*parts)
+    return datetime(*parts)
+
+def user_to_dt(s, as_type='datetime'):
+    dt = _parse_user_dt(s)
     return dt if as_type == 'datetime' else dt.strftime("%Y-%m-%dT%H:%M:%S")
 
-def fetch_dukascopy_ohclv(symbol, user_tf, user_start, user_end):
+# How each provider's client reads a naive datetime: alpaca-py assumes UTC,
+# ccxt callers (.timestamp()) and dukascopy_python use local wall-clock time
+NAIVE_UTC_PROVIDERS = frozenset({"alpaca"})
+NAIVE_LOCAL_PROVIDERS = frozenset({"binance", "dukascopy"})
+
+def window_closed(end, bar_seconds, bars=2, provider=None):
+    """
+    True once `end` is `bars` bars in the past, compared in epoch seconds.
+    A naive end is read the way `provider` reads it; for any other provider
+    (cache, parallel, unknown) it must have closed under both readings.
+    """
+    ts = end.timestamp()
+    if end.tzinfo is None and provider not in NAIVE_LOCAL_PROVIDERS:
+        as_utc = end.replace(tzinfo=timezone.utc).timestamp()
+        ts = as_utc if provider in NAIVE_UTC_PROVIDERS else max(ts, as_utc)
+    return ts < time.time() - bars * bar_seconds
+
+_DUKASCOPY_UNIT_SECONDS = {
+    "SEC": 1, "MIN": 60, "HOUR": 3600, "DAY": 86400,
+    "WEEK": 7 * 86400, "MONTH": 31 * 86400, "YEAR": 366 * 86400,
+}
+
+def _dukascopy_interval_seconds(interval):
+    # "30MIN" -> 1800; ticks have no bar to wait for
+    num = interval.rstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    return int(num or 1) * _DUKASCOPY_UNIT_SECONDS.get(interval[len(num):], 0)
+
+def fetch_dukascopy_frame(symbol, interval, start, end):
     from dukascopy_python import fetch, OFFER_SIDE_BID
-    symbol = symbol.strip().upper()
+    # Closed windows are immutable: serve them from memory / Parquet instead of the network
+    if not settings.cache_enabled or not window_closed(end, _dukascopy_interval_seconds(interval), provider="dukascopy"):
+        return fetch(symbol, interval, OFFER_SIDE_BID, start=start, end=end)
+    key = ("dukascopy", symbol, interval, start, end)
+    df = memory_cache.get(key)
+    if df is not None:
+        return df
+    cached = cache_manager.check_cache(symbol, "dukascopy", interval, start, end)
+    if cached is not None:
+        df = cached.set_index(cached.columns[0])
+    else:
+        df = fetch(symbol, interval, OFFER_SIDE_BID, start=start, end=end)
+        if df is None or df.empty:
+            return df
+        cache_manager.save_cache(df.reset_index(), symbol, "dukascopy", interval, start, end)
+    memory_cache.set(key, df)
+    return df
+
+def disk_cached(provider, kind, batch_cls, columns, tf=None):
+    """
+    Persist a fetcher's batches in the Parquet cache, keyed on
+    (provider_kind, symbol, tf, start, end). Only windows that closed at
+    least two bars ago, as `provider` reads the end, are stored, so a
+    still-forming candle is never frozen. A fixed `tf` (ticks) replaces
+    the caller's timeframe, which is then ignored.
+    """
+    data_type = f"{provider}_{kind}"
+    def decorate(fetch):
+        @wraps(fetch)
+        def cached_fetch(symbol, user_tf, user_start, user_end, *args):
+            if not settings.cache_enabled:
+                return fetch(symbol, user_tf, user_start, user_end, *args)
+            start = user_to_dt(user_start, 'datetime')
+            end = user_to_dt(user_end, 'datetime')
+            bar_seconds = 0 if tf else _tf_seconds(user_tf)
+            if not window_closed(end, bar_seconds, provider=provider):
+                return fetch(symbol, user_tf, user_start, user_end, *args)
+            sym, key_tf = _norm_symbol(symbol), tf or user_tf.strip().lower()
+            cached = cache_manager.check_cache(sym, data_type, key_tf, start, end)
+            if cached is not None:
+                data = cached.reindex(columns=columns).to_numpy(dtype=np.float64)
+                return batch_cls(np.ascontiguousarray(data), pd.DatetimeIndex(cached["time"]))
+            batch = fetch(symbol, user_tf, user_start, user_end, *args)
+            frame = pd.DataFrame(batch.data, columns=columns)
+            frame.insert(0, "time", batch.times)
+            cache_manager.save_cache(frame, sym, data_type, key_tf, start, end)
+            return batch
+        return cached_fetch
+    return decorate
+
+def fetch_dukascopy_ohclv(symbol, user_tf, user_start, user_end):
+    symbol = _norm_symbol(symbol)
     tf = user_to_dukascopy_tf(user_tf)
     start = user_to_dt(user_start, 'datetime')
     end = user_to_dt(user_end, 'datetime')
-    df = fetch(symbol, tf, OFFER_SIDE_BID, start=start, end=end)
+    df = fetch_dukascopy_frame(symbol, tf, start, end)
     if df is None or df.empty: raise ValueError(f"No Dukascopy data for {symbol}")
-    opens, highs, lows, closes = df["open"].tolist(), df["high"].tolist(), df["low"].tolist(), df["close"].tolist()
-    volumes = df["volume"].tolist() if "volume" in df else [0] * len(df)
-    times = list(df.index.to_pydatetime())
-    return opens, highs, lows, closes, volumes, times
+    # One 2-D extraction instead of a Series->list pass per column; missing volume -> 0
+    data = df.reindex(columns=OHLCV_COLUMNS, fill_value=0).to_numpy(dtype=np.float64)
+    return OHLCVBatch(np.ascontiguousarray(data), df.index)
 
+@disk_cached("binance", "ohlcv", OHLCVBatch, OHLCV_COLUMNS)
 def fetch_binance_ohclv(symbol, user_tf, user_start, user_end):
-    exchange = ccxt.binance({'enableRateLimit': True})
-    symbol = symbol.strip().upper()
+    symbol = _norm_symbol(symbol)
     binance_symbol = symbol.replace("/", "")
     tf = user_to_binance_tf(user_tf)
-    since_str, end_str = user_to_dt(user_start, 'iso'), user_to_dt(user_end, 'iso')
-    since = int(datetime.fromisoformat(since_str).timestamp() * 1000)
-    end_ms = int(datetime.fromisoformat(end_str).timestamp() * 1000)
-    limit, all_ohlcv = 1000, []
-    while since < end_ms:
-        ohlcv = exchange.fetch_ohlcv(binance_symbol, tf, since, limit)
-        if not ohlcv: break
-        filtered = [c for c in ohlcv if c[0] <= end_ms]
-        all_ohlcv.extend(filtered)
-        if len(ohlcv) < limit: break
-        since = ohlcv[-1][0] + 1
+    limit = 1000
+    windows = page_windows(
+        int(user_to_dt(user_start, 'datetime').timestamp() * 1000),
+        int(user_to_dt(user_end, 'datetime').timestamp() * 1000),
+        _binance.parse_timeframe(tf) * 1000, limit
+    )
+    def fetch_window(window_start):
+        ohlcv = _binance.fetch_ohlcv(binance_symbol, tf, window_start, limit)
+        return clip_page(ohlcv, window_start, windows)
+    if len(windows) > 1:
+        # Own pool: this already runs on a provider_pool thread
+        with ThreadPoolExecutor(max_workers=settings.max_parallel_chunks) as pool:
+            batches = list(pool.map(fetch_window, windows))
+    else:
+        batches = [fetch_window(ws) for ws in windows]
+    all_ohlcv = [bar for batch in batches for bar in batch]
     if not all_ohlcv: raise ValueError(f"No Binance data for {symbol}")
-    timestamps, opens, highs, lows, closes, volumes = zip(*all_ohlcv)
-    times = [datetime.fromtimestamp(t / 1000) for t in timestamps]
-    return list(opens), list(highs), list(lows), list(closes), list(volumes), times
+    # (N, 6) array in one C-level copy, no per-row tuples
+    arr = np.asarray(all_ohlcv, dtype=np.float64)
+    times = ms_to_local_datetimes(arr[:, 0].astype(np.int64))
+    return OHLCVBatch(np.ascontiguousarray(arr[:, 1:]), times)
 
+@disk_cached("alpaca", "ohlcv", OHLCVBatch, OHLCV_COLUMNS)
 def fetch_alpaca_ohclv(symbol, user_tf, user_start, user_end, api_key, secret_key):
     from alpaca.data.historical import StockHistoricalDataClient, CryptoHistoricalDataClient
     from alpaca.data.requests import StockBarsRequest, CryptoBarsRequest
     from alpaca.data.timeframe import TimeFrame
-    symbol = symbol.strip().upper()
+    symbol = _norm_symbol(symbol)
     tf = user_to_alpaca_tf(user_tf)
     tf_map = {'1Min': TimeFrame.Minute, '5Min': TimeFrame(5, TimeFrame.Minute), '15Min': TimeFrame(15, TimeFrame.Minute), '30Min': TimeFrame(30, TimeFrame.Minute), '1Hour': TimeFrame.Hour, '1Day': TimeFrame.Day, '1Week': TimeFrame.Week}
-    start = user_to_dt(user_start, 'iso')
-    end = user_to_dt(user_end, 'iso')
+    start = user_to_dt(user_start, 'datetime')
+    end = user_to_dt(user_end, 'datetime')
     
     # Check if crypto
     is_crypto = '/' in symbol or symbol in ['BTCUSD', 'ETHUSD'] # Simple heuristic
     
     if is_crypto:
-        client = CryptoHistoricalDataClient(api_key, secret_key) # Crypto client doesn't strictly need keys for some pairs but good to pass
+        client = alpaca_client(CryptoHistoricalDataClient, api_key, secret_key) # Crypto client doesn't strictly need keys for some pairs but good to pass
         # Alpaca Crypto symbols often like BTC/USD
         request = CryptoBarsRequest(
             symbol_or_symbols=symbol,
             timeframe=tf_map[tf],
-            start=datetime.fromisoformat(start), end=datetime.fromisoformat(end)
+            start=start, end=end
         )
         bars = client.get_crypto_bars(request).df
     else:
-        client = StockHistoricalDataClient(api_key, secret_key)
+        client = alpaca_client(StockHistoricalDataClient, api_key, secret_key)
         request = StockBarsRequest(
             symbol_or_symbols=symbol,
             timeframe=tf_map[tf],
-            start=datetime.fromisoformat(start), end=datetime.fromisoformat(end), feed='sip'
+            start=start, end=end, feed='sip'
         )
         bars = client.get_stock_bars(request).df
 
     if bars.empty: raise ValueError(f"No Alpaca data for {symbol}")
     if isinstance(bars.index, pd.MultiIndex): bars = bars.loc[symbol]
     bars = bars.sort_index()
-    opens, highs, lows, closes, volumes = bars['open'].tolist(), bars['high'].tolist(), bars['low'].tolist(), bars['close'].tolist(), bars['volume'].tolist()
-    times = list(bars.index.to_pydatetime())
-    return opens, highs, lows, closes, volumes, times
+    data = bars[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+    return OHLCVBatch(np.ascontiguousarray(data), bars.index)
 
-def fetch_unified_ohclv(symbol, user_tf, user_start, user_end, api_key=None, secret_key=None):
+def _timed_call(name, func, args):
+    # Runs in the worker thread, so health is recorded even for cancelled losers
+    started = time.perf_counter()
     try:
-        return fetch_dukascopy_ohclv(symbol, user_tf, user_start, user_end)
+        result = func(*args)
     except Exception as e:
-        print("Dukascopy:", e)
+        if is_upstream_error(e):
+            provider_health.mark_unhealthy(name, e)
+        raise
+    provider_health.mark_healthy(name, (time.perf_counter() - started) * 1000)
+    return result
+
+async def race_providers(calls):
+    """
+    Run provider fetches concurrently and return the first success.
+
+    `calls` maps provider name -> (func, args), primary first. Providers
+    that recently failed upstream are skipped until provider_retry_seconds
+    has passed, except the primary, which is always tried; all run on
+    provider_pool, ranked healthy-first then by latency. As soon as one
+    returns, the others are cancelled. Returns (provider, result, errors)
+    where errors maps provider name -> exception.
+    """
+    ranked = [name for name in provider_health.get_ranked_providers() if name in calls]
+    primary = next(iter(calls), None)
+    if primary is not None and primary not in ranked:
+        ranked.append(primary)
+    errors = {
+        name: RuntimeError("skipped, marked unhealthy")
+        for name in calls if name not in ranked
+    }
+    loop = asyncio.get_running_loop()
+    tasks = {
+        loop.run_in_executor(provider_pool, _timed_call, name, *calls[name]): name
+        for name in ranked
+    }
+    pending = set(tasks)
     try:
-        return fetch_binance_ohclv(symbol, user_tf, user_start, user_end)
-    except Exception as e:
-        print("Binance:", e)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # Collect every failure in this batch so none goes unretrieved
+            succeeded = []
+            for task in (t for t in tasks if t in done):
+                if task.exception() is None:
+                    succeeded.append(task)
+                else:
+                    errors[tasks[task]] = task.exception()
+            if succeeded:
+                # Prefer the higher-ranked provider if several finished together
+                return tasks[succeeded[0]], succeeded[0].result(), errors
+    finally:
+        for task in pending:
+            task.cancel()
+    return None, None, errors
+
+def _tf_seconds(user_tf):
+    try:
+        return _binance.parse_timeframe(user_to_binance_tf(user_tf))
+    except Exception:
+        return 0  # ticks, or a timeframe Binance can't express
+
+def memory_cache_ttl(user_tf, end, provider=None):
+    """
+    TTL for a cached unified result: None (keep until evicted) once the
+    window's last candle has closed, as `provider` reads the end, otherwise
+    a short recent-data TTL.
+    """
+    if window_closed(end, _tf_seconds(user_tf), bars=1, provider=provider):
+        return None
+    return settings.memory_cache_recent_ttl_seconds
+
+async def fetch_unified_ohclv_async(symbol, user_tf, user_start, user_end, api_key=None, secret_key=None):
+    key = ("ohlcv", _norm_symbol(symbol), user_tf.strip().lower(), user_start, user_end, bool(api_key and secret_key))
+    cached = memory_cache.get(key)
+    if cached is not None:
+        return cached
+    calls = {
+        "dukascopy": (fetch_dukascopy_ohclv, (symbol, user_tf, user_start, user_end)),
+        "binance": (fetch_binance_ohclv, (symbol, user_tf, user_start, user_end)),
+    }
     if api_key and secret_key:
-        try:
-            return fetch_alpaca_ohclv(symbol, user_tf, user_start, user_end, api_key, secret_key)
-        except Exception as e:
-            print("Alpaca:", e)
-    return None
+        calls["alpaca"] = (fetch_alpaca_ohclv, (symbol, user_tf, user_start, user_end, api_key, secret_key))
+    provider, result, errors = await race_providers(
+        {name: calls[name] for name in get_provider_order(symbol) if name in calls}
+    )
+    for name, e in errors.items():
+        print(f"{name.capitalize()}:", e)
+    if result is not None:
+        # Shared between callers from now on
+        result.data.setflags(write=False)
+        memory_cache.set(key, result, memory_cache_ttl(user_tf, user_to_dt(user_end), provider))
+    return result
+
+def fetch_unified_ohclv(symbol, user_tf, user_start, user_end, api_key=None, secret_key=None):
+    return asyncio.run(fetch_unified_ohclv_async(symbol, user_tf, user_start, user_end, api_key, secret_key))
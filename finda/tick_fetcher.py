@@ -1,41 +1,43 @@
-import ccxt
+import asyncio
+import numpy as np
 import pandas as pd
-from datetime import datetime
 
-def user_to_dt(s, as_type='datetime'):
-    parts = [int(p) for p in s.split('-')]
-    while len(parts) < 6:
-        parts.append(0)
-    dt = datetime(*parts)
-    return dt if as_type == 'datetime' else dt.strftime("%Y-%m-%dT%H:%M:%S")
+from .ohlcv_fetcher import (
+    race_providers, ms_to_local_datetimes, user_to_dt, fetch_dukascopy_frame,
+    memory_cache_ttl, disk_cached, _binance, _norm_symbol, ColumnarBatch,
+)
+from .cache_manager import memory_cache
+from .clients import alpaca_client
+from .config import get_provider_order
+
+TICK_COLUMNS = ["bid", "ask", "bid_volume", "ask_volume", "volume"]
+
+class TickBatch(ColumnarBatch):
+    """ColumnarBatch ordered as TICK_COLUMNS; missing bid/ask is NaN."""
+    __slots__ = ()
 
 def fetch_dukascopy_ticks(symbol, user_tf, user_start, user_end):
-    from dukascopy_python import fetch, INTERVAL_TICK, OFFER_SIDE_BID
-    symbol = symbol.strip().upper()
+    from dukascopy_python import INTERVAL_TICK
+    symbol = _norm_symbol(symbol)
     start = user_to_dt(user_start, 'datetime')
     end = user_to_dt(user_end, 'datetime')
-    df = fetch(symbol, INTERVAL_TICK, OFFER_SIDE_BID, start=start, end=end)
+    df = fetch_dukascopy_frame(symbol, INTERVAL_TICK, start, end)
     if df is None or df.empty:
         raise ValueError(f"No Dukascopy tick data for {symbol}")
-    bid = df["bidPrice"].tolist() if "bidPrice" in df else [0] * len(df)
-    ask = df["askPrice"].tolist() if "askPrice" in df else [0] * len(df)
-    bid_vol = df["bidVolume"].tolist() if "bidVolume" in df else [0] * len(df)
-    ask_vol = df["askVolume"].tolist() if "askVolume" in df else [0] * len(df)
-    real_vol = [0] * len(df)
-    times = list(df.index.to_pydatetime())
-    return bid, ask, bid_vol, ask_vol, real_vol, times
+    cols = ["bidPrice", "askPrice", "bidVolume", "askVolume"]
+    data = np.zeros((len(df), len(TICK_COLUMNS)))  # no real volume from Dukascopy
+    data[:, :4] = df.reindex(columns=cols, fill_value=0).to_numpy(dtype=np.float64)
+    return TickBatch(data, df.index)
 
+@disk_cached("binance", "tick", TickBatch, TICK_COLUMNS, tf="tick")
 def fetch_binance_ticks(symbol, user_tf, user_start, user_end):
-    exchange = ccxt.binance({'enableRateLimit': True})
-    symbol = symbol.strip().upper()
+    symbol = _norm_symbol(symbol)
     binance_symbol = symbol.replace("/", "")
-    since_str = user_to_dt(user_start, 'iso')
-    end_str = user_to_dt(user_end, 'iso')
-    since = int(datetime.fromisoformat(since_str).timestamp() * 1000)
-    end_ms = int(datetime.fromisoformat(end_str).timestamp() * 1000)
+    since = int(user_to_dt(user_start, 'datetime').timestamp() * 1000)
+    end_ms = int(user_to_dt(user_end, 'datetime').timestamp() * 1000)
     trades = []
     while since < end_ms:
-        batch = exchange.fetch_trades(binance_symbol, since=since, limit=1000)
+        batch = _binance.fetch_trades(binance_symbol, since=since, limit=1000)
         if not batch: break
         for t in batch:
             if t['timestamp'] > end_ms: break
@@ -44,51 +46,46 @@ def fetch_binance_ticks(symbol, user_tf, user_start, user_end):
         since = batch[-1]['timestamp'] + 1
     if not trades:
         raise ValueError(f"No Binance tick data for {symbol}")
-    bid, ask, bid_vol, ask_vol, real_vol, times = [], [], [], [], [], []
-    for t in trades:
-        side = t.get('side')
-        if side == 'buy':
-            bid.append(None)
-            ask.append(t['price'])
-            bid_vol.append(0)
-            ask_vol.append(t['amount'])
-        elif side == 'sell':
-            bid.append(t['price'])
-            ask.append(None)
-            bid_vol.append(t['amount'])
-            ask_vol.append(0)
-        else:
-            bid.append(None)
-            ask.append(None)
-            bid_vol.append(0)
-            ask_vol.append(0)
-        real_vol.append(t['amount'])
-        times.append(datetime.fromtimestamp(t['timestamp'] / 1000))
-    return bid, ask, bid_vol, ask_vol, real_vol, times
+    # Bid/ask inferred from trade side; the empty side is NaN
+    n = len(trades)
+    ts_ms = np.fromiter((t['timestamp'] for t in trades), dtype=np.int64, count=n)
+    price = np.fromiter((t['price'] for t in trades), dtype=np.float64, count=n)
+    amount = np.fromiter((t['amount'] for t in trades), dtype=np.float64, count=n)
+    side = np.fromiter((t.get('side') or '' for t in trades), dtype='U4', count=n)
+    is_buy, is_sell = side == 'buy', side == 'sell'
+    data = np.column_stack([
+        np.where(is_sell, price, np.nan),
+        np.where(is_buy, price, np.nan),
+        np.where(is_sell, amount, 0.0),
+        np.where(is_buy, amount, 0.0),
+        amount,
+    ])
+    return TickBatch(data, ms_to_local_datetimes(ts_ms))
 
+@disk_cached("alpaca", "tick", TickBatch, TICK_COLUMNS, tf="tick")
 def fetch_alpaca_ticks(symbol, user_tf, user_start, user_end, api_key, secret_key):
     from alpaca.data.historical import StockHistoricalDataClient, CryptoHistoricalDataClient
     from alpaca.data.requests import StockTradesRequest, CryptoTradesRequest
-    symbol = symbol.strip().upper()
-    start = user_to_dt(user_start, 'iso')
-    end = user_to_dt(user_end, 'iso')
+    symbol = _norm_symbol(symbol)
+    start = user_to_dt(user_start, 'datetime')
+    end = user_to_dt(user_end, 'datetime')
     
     is_crypto = '/' in symbol or symbol in ['BTCUSD', 'ETHUSD']
     
     if is_crypto:
-        client = CryptoHistoricalDataClient(api_key, secret_key)
+        client = alpaca_client(CryptoHistoricalDataClient, api_key, secret_key)
         request = CryptoTradesRequest(
             symbol_or_symbols=symbol,
-            start=datetime.fromisoformat(start),
-            end=datetime.fromisoformat(end),
+            start=start,
+            end=end,
         )
         trades = client.get_crypto_trades(request).df
     else:
-        client = StockHistoricalDataClient(api_key, secret_key)
+        client = alpaca_client(StockHistoricalDataClient, api_key, secret_key)
         request = StockTradesRequest(
             symbol_or_symbols=symbol,
-            start=datetime.fromisoformat(start),
-            end=datetime.fromisoformat(end),
+            start=start,
+            end=end,
         )
         trades = client.get_stock_trades(request).df
 
@@ -96,31 +93,34 @@ def fetch_alpaca_ticks(symbol, user_tf, user_start, user_end, api_key, secret_ke
         raise ValueError(f"No Alpaca tick (trade) data for {symbol}")
     if isinstance(trades.index, pd.MultiIndex):
         trades = trades.loc[symbol]
-    bid = trades['price'].tolist() if 'price' in trades else [0]*len(trades)
-    ask = trades['price'].tolist() if 'price' in trades else [0]*len(trades)
-    bid_vol = [0]*len(trades)
-    ask_vol = [0]*len(trades)
-    real_vol = trades['size'].tolist() if 'size' in trades else [0]*len(trades)
-    times = list(trades.index.to_pydatetime())
-    return bid, ask, bid_vol, ask_vol, real_vol, times
+    # Trades carry no quote side: price fills both bid and ask
+    price, size = trades.reindex(columns=['price', 'size'], fill_value=0).to_numpy(dtype=np.float64).T
+    data = np.zeros((len(trades), len(TICK_COLUMNS)))
+    data[:, 0] = data[:, 1] = price
+    data[:, 4] = size
+    return TickBatch(data, trades.index)
 
-def fetch_unified_tick(symbol, user_tf, user_start, user_end, api_key=None, secret_key=None):
-    # Try Dukascopy first
-    try:
-        return "dukascopy", fetch_dukascopy_ticks(symbol, user_tf, user_start, user_end)
-    except Exception as e:
-        print("Dukascopy:", e)
-    # Try Binance next
-    try:
-        return "binance", fetch_binance_ticks(symbol, user_tf, user_start, user_end)
-    except Exception as e:
-        print("Binance:", e)
-    # Try Alpaca if keys present
+async def fetch_unified_tick_async(symbol, user_tf, user_start, user_end, api_key=None, secret_key=None):
+    key = ("tick", _norm_symbol(symbol), user_start, user_end, bool(api_key and secret_key))
+    cached = memory_cache.get(key)
+    if cached is not None:
+        return cached
+    # Race Dukascopy, Binance and Alpaca (if keys present) concurrently
+    calls = {
+        "dukascopy": (fetch_dukascopy_ticks, (symbol, user_tf, user_start, user_end)),
+        "binance": (fetch_binance_ticks, (symbol, user_tf, user_start, user_end)),
+    }
     if api_key and secret_key:
-        try:
-            return "alpaca", fetch_alpaca_ticks(symbol, user_tf, user_start, user_end, api_key, secret_key)
-        except Exception as e:
-            print("Alpaca:", e)
-    return None, None
-
+        calls["alpaca"] = (fetch_alpaca_ticks, (symbol, user_tf, user_start, user_end, api_key, secret_key))
+    provider, result, errors = await race_providers(
+        {name: calls[name] for name in get_provider_order(symbol) if name in calls}
+    )
+    for name, e in errors.items():
+        print(f"{name.capitalize()}:", e)
+    if result is not None:
+        result.data.setflags(write=False)
+        memory_cache.set(key, (provider, result), memory_cache_ttl(user_tf, user_to_dt(user_end), provider))
+    return provider, result
 
+def fetch_unified_tick(symbol, user_tf, user_start, user_end, api_key=None, secret_key=None):
+    return asyncio.run(fetch_unified_tick_async(symbol, user_tf, user_start, user_end, api_key, secret_key))
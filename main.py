@@ -7,9 +7,12 @@ v2.0.0 - Institutional-grade financial data pipeline
 
 from fastapi import FastAPI, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, List
+import asyncio
 import logging
+import orjson
 
 from finda.schemas import (
     Candle, Tick, OHLCVResponse, TickResponse,
@@ -19,21 +22,41 @@ from finda.config import settings, logger
 from finda.async_ohlcv import (
     fetch_ohlcv_unified_async, 
     fetch_ohlcv_chunked_parallel,
-    df_to_candles,
-    provider_health
+    df_to_candle_records,
+    df_to_candle_columns,
+    provider_health,
+    open_async_clients,
+    close_async_clients,
+    columns_to_records
 )
 from finda.async_tick import (
     fetch_tick_unified_async,
-    df_to_ticks
+    df_to_tick_records
 )
-from finda.cache_manager import cache_manager
+from finda.cache_manager import MemoryCache, cache_manager, memory_cache
+from finda.ohlcv_fetcher import memory_cache_ttl
 from finda.live_streamer import calculate_notional, get_contract_size
 
+# numpy arrays/scalars serialize natively (no tolist() copy); naive datetimes are UTC
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+
+# Rows serialized per chunk by the streaming endpoints
+STREAM_CHUNK_ROWS = 1000
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (C encoder for floats and datetimes)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
 # Initialize FastAPI
 app = FastAPI(
     title="Finda Pro-Grade Data Engine",
     description="Institutional-grade async financial data pipeline with caching",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -46,6 +69,19 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+async def startup_clients():
+    """Pool upstream connections across requests for the app's lifetime."""
+    open_async_clients()
+
+
+@app.on_event("shutdown")
+async def shutdown_clients():
+    """Close shared upstream connections."""
+    # provider_pool belongs to the library (the sync API uses it too), so it stays up
+    await close_async_clients()
+
+
 def parse_datetime(s: str) -> datetime:
     """Parse flexible datetime string."""
     # Try ISO format first
@@ -61,6 +97,91 @@ def parse_datetime(s: str) -> datetime:
     return datetime(*parts)
 
 
+# Upstream fetches currently in progress, keyed on the normalized request
+_inflight: Dict[Hashable, asyncio.Task] = {}
+
+
+async def single_flight(key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Await the in-progress fetch for `key`, or start it if there is none.
+
+    Identical concurrent requests share one upstream call. The shared task
+    is shielded so one client disconnecting doesn't cancel it for the rest.
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+
+# Serialized /ohlcv and /tick bodies, so repeated requests skip records + orjson
+body_cache = MemoryCache(settings.body_cache_size, max_bytes=settings.body_cache_max_mb * 2**20)
+
+
+def body_cache_ttl(tf: str, end_dt: datetime, provider: str) -> Optional[float]:
+    """Keep bodies for closed windows until evicted; recent ones expire quickly."""
+    return memory_cache_ttl(tf, end_dt, provider)
+
+
+def store_body(key: Hashable, body: bytes, ttl: Optional[float]) -> None:
+    """Cache a response body without its trailing "cached" flag."""
+    body_cache.set(key, body.rpartition(b'"cached":')[0], ttl)
+
+
+def cached_body_response(key: Hashable) -> Optional[Response]:
+    """Replay a stored body, now marked "cached": true; None on a miss."""
+    body = body_cache.get(key)
+    if body is None:
+        return None
+    return Response(body + b'"cached":true}', media_type="application/json")
+
+
+async def load_ohlcv(symbol: str, tf: str, start: str, end: str,
+                     use_cache: bool, parallel: bool):
+    """Fetch (df, provider, cached) for an OHLCV request; 404 if empty."""
+    start_dt = parse_datetime(start)
+    end_dt = parse_datetime(end)
+    
+    if parallel:
+        df = await single_flight(
+            ("ohlcv_parallel", symbol, tf, start_dt, end_dt),
+            lambda: fetch_ohlcv_chunked_parallel(symbol, tf, start_dt, end_dt)
+        )
+        provider = "parallel"
+        cached = False
+    else:
+        df, provider, cached = await single_flight(
+            ("ohlcv", symbol, tf, start_dt, end_dt, use_cache),
+            lambda: fetch_ohlcv_unified_async(
+                symbol, tf, start_dt, end_dt, use_cache=use_cache
+            )
+        )
+    
+    if df.empty:
+        raise HTTPException(status_code=404, detail=f"No data found for {symbol}")
+    return df, provider, cached
+
+
+async def load_ticks(symbol: str, start: str, end: str,
+                     provider: Optional[str], use_cache: bool):
+    """Fetch (df, provider, cached) for a tick request; 404 if empty."""
+    start_dt = parse_datetime(start)
+    end_dt = parse_datetime(end)
+    
+    df, prov, cached = await single_flight(
+        ("tick", symbol, start_dt, end_dt, provider, use_cache),
+        lambda: fetch_tick_unified_async(
+            symbol, start_dt, end_dt, provider=provider, use_cache=use_cache
+        )
+    )
+    
+    if df.empty:
+        raise HTTPException(status_code=404, detail=f"No tick data for {symbol}")
+    return df, prov, cached
+
+
 @app.get("/ohlcv", response_model=OHLCVResponse)
 async def get_ohlcv(
     symbol: str = Query(..., example="EUR/USD"),
@@ -78,36 +199,81 @@ async def get_ohlcv(
     - Parallel chunked fetching for large ranges
     """
     try:
-        start_dt = parse_datetime(start)
         end_dt = parse_datetime(end)
+        key = ("ohlcv", symbol, tf, parse_datetime(start), end_dt, parallel)
+        if use_cache:
+            hit = cached_body_response(key)
+            if hit is not None:
+                return hit
         
-        if parallel:
-            df = await fetch_ohlcv_chunked_parallel(symbol, tf, start_dt, end_dt)
-            provider = "parallel"
-            cached = False
-        else:
-            df, provider, cached = await fetch_ohlcv_unified_async(
-                symbol, tf, start_dt, end_dt, use_cache=use_cache
-            )
+        df, provider, cached = await load_ohlcv(symbol, tf, start, end, use_cache, parallel)
+        
+        # Plain dicts straight to orjson; response_model is kept for the docs only
+        candles = df_to_candle_records(df)
         
-        if df.empty:
-            raise HTTPException(status_code=404, detail=f"No data found for {symbol}")
+        response = ORJSONResponse({
+            "symbol": symbol,
+            "timeframe": tf,
+            "provider": provider,
+            "count": len(candles),
+            "data": candles,
+            "cached": cached
+        })
+        # A parallel fetch may have dropped failed chunks: don't pin a partial body
+        if use_cache and not df.attrs.get("failed_chunks"):
+            store_body(key, response.body, body_cache_ttl(tf, end_dt, provider))
+        return response
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("OHLCV error: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/ohlcv/columnar")
+async def get_ohlcv_columnar(
+    symbol: str = Query(..., example="EUR/USD"),
+    tf: str = Query(..., example="1m"),
+    start: str = Query(..., example="2025-01-01"),
+    end: str = Query(..., example="2025-01-02"),
+    use_cache: bool = Query(True, description="Use Parquet cache"),
+    parallel: bool = Query(False, description="Use parallel chunked fetching")
+):
+    """
+    Fetch OHLCV candles as columns instead of rows.
+    
+    - Same fetch path and parameters as /ohlcv
+    - One array per field in "columns" order; numpy arrays serialize directly
+    """
+    try:
+        end_dt = parse_datetime(end)
+        key = ("ohlcv_columnar", symbol, tf, parse_datetime(start), end_dt, parallel)
+        if use_cache:
+            hit = cached_body_response(key)
+            if hit is not None:
+                return hit
         
-        candles = df_to_candles(df)
+        df, provider, cached = await load_ohlcv(symbol, tf, start, end, use_cache, parallel)
+        columns = df_to_candle_columns(df)
         
-        return OHLCVResponse(
-            symbol=symbol,
-            timeframe=tf,
-            provider=provider,
-            count=len(candles),
-            data=candles,
-            cached=cached
-        )
+        response = ORJSONResponse({
+            "symbol": symbol,
+            "timeframe": tf,
+            "provider": provider,
+            "count": len(df),
+            "columns": list(columns),
+            **columns,
+            "cached": cached
+        })
+        if use_cache and not df.attrs.get("failed_chunks"):
+            store_body(key, response.body, body_cache_ttl(tf, end_dt, provider))
+        return response
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"OHLCV error: {e}")
+        logger.error("OHLCV columnar error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -127,30 +293,106 @@ async def get_tick(
     - Smart fallback across providers
     """
     try:
-        start_dt = parse_datetime(start)
         end_dt = parse_datetime(end)
+        key = ("tick", symbol, parse_datetime(start), end_dt, provider)
+        if use_cache:
+            hit = cached_body_response(key)
+            if hit is not None:
+                return hit
         
-        df, prov, cached = await fetch_tick_unified_async(
-            symbol, start_dt, end_dt, provider=provider, use_cache=use_cache
-        )
-        
-        if df.empty:
-            raise HTTPException(status_code=404, detail=f"No tick data for {symbol}")
+        df, prov, cached = await load_ticks(symbol, start, end, provider, use_cache)
         
-        ticks = df_to_ticks(df)
+        ticks = df_to_tick_records(df)
         
-        return TickResponse(
-            symbol=symbol,
-            provider=prov,
-            count=len(ticks),
-            data=ticks,
-            cached=cached
+        response = ORJSONResponse({
+            "symbol": symbol,
+            "provider": prov,
+            "count": len(ticks),
+            "data": ticks,
+            "cached": cached
+        })
+        if use_cache:
+            store_body(key, response.body, body_cache_ttl("tick", end_dt, prov))
+        return response
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Tick error: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def record_chunks(df, to_records: Callable, chunk_rows: int = STREAM_CHUNK_ROWS):
+    """Lazily convert df to records chunk_rows rows at a time, so only one chunk is ever built."""
+    for i in range(0, len(df), chunk_rows):
+        yield to_records(df.iloc[i:i + chunk_rows])
+
+
+def stream_ndjson(chunks):
+    """Yield each chunk of records as newline-delimited JSON, one write per chunk."""
+    for records in chunks:
+        yield b"".join([
+            orjson.dumps(r, option=ORJSON_OPTIONS) + b"\n"
+            for r in records
+        ])
+
+
+@app.get("/ohlcv/stream")
+async def stream_ohlcv(
+    symbol: str = Query(..., example="EUR/USD"),
+    tf: str = Query(..., example="1m"),
+    start: str = Query(..., example="2025-01-01"),
+    end: str = Query(..., example="2025-01-02"),
+    use_cache: bool = Query(True, description="Use Parquet cache"),
+    parallel: bool = Query(False, description="Use parallel chunked fetching")
+):
+    """
+    Stream OHLCV candles as NDJSON, one candle per line.
+    
+    - Same fetch path and parameters as /ohlcv
+    - Provider and cache status in X-Provider / X-Cached headers
+    """
+    try:
+        df, provider, cached = await load_ohlcv(symbol, tf, start, end, use_cache, parallel)
+        return StreamingResponse(
+            stream_ndjson(record_chunks(df, df_to_candle_records)),
+            media_type="application/x-ndjson",
+            headers={"X-Provider": provider, "X-Cached": str(cached).lower()}
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("OHLCV stream error: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/tick/stream")
+async def stream_tick(
+    symbol: str = Query(..., example="EUR/USD"),
+    start: str = Query(..., example="2025-01-01"),
+    end: str = Query(..., example="2025-01-01-01-00-00"),
+    provider: Optional[str] = Query(None, example="dukascopy"),
+    use_cache: bool = Query(True)
+):
+    """
+    Stream tick-level Bid/Ask data as NDJSON, one tick per line.
+    
+    - Same fetch path and parameters as /tick
+    - Provider and cache status in X-Provider / X-Cached headers
+    """
+    try:
+        df, prov, cached = await load_ticks(symbol, start, end, provider, use_cache)
+        return StreamingResponse(
+            stream_ndjson(record_chunks(df, df_to_tick_records)),
+            media_type="application/x-ndjson",
+            headers={"X-Provider": prov, "X-Cached": str(cached).lower()}
         )
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Tick error: {e}")
+        logger.error("Tick stream error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -208,6 +450,8 @@ async def clear_cache(symbol: Optional[str] = Query(None)):
     - Optionally filter by symbol
     """
     deleted = cache_manager.clear_cache(symbol)
+    memory_cache.clear()
+    body_cache.clear()
     return {"deleted": deleted, "symbol": symbol or "all"}
 
 
@@ -247,36 +491,58 @@ async def health_check():
     }
 
 
-# Legacy sync endpoints preserved for backward compatibility
-from finda.ohlcv_fetcher import fetch_unified_ohclv
+# Legacy endpoints preserved for backward compatibility
+from finda.ohlcv_fetcher import fetch_unified_ohclv_async, OHLCV_COLUMNS
 from finda.tick_fetcher import fetch_dukascopy_ticks, fetch_binance_ticks
 
+
+def stream_records(head: dict, chunks):
+    """
+    Yield `{**head, "data": records}` as JSON bytes, one chunk of records
+    at a time, so large ranges never build all rows or one big body string.
+    """
+    yield orjson.dumps({**head, "data": []}, option=ORJSON_OPTIONS)[:-2]
+    sep = b""
+    for records in chunks:
+        if records:
+            yield sep + orjson.dumps(records, option=ORJSON_OPTIONS)[1:-1]
+            sep = b","
+    yield b"]}"
+
+
+def batch_record_chunks(batch, chunk_rows: int = STREAM_CHUNK_ROWS):
+    """Lazily convert an OHLCVBatch to records chunk_rows rows at a time."""
+    fields = ("time", *OHLCV_COLUMNS)
+    for i in range(0, len(batch.times), chunk_rows):
+        rows = slice(i, i + chunk_rows)
+        yield columns_to_records(
+            fields, [batch.times[rows].astype(str).tolist(), *batch.data[rows].T.tolist()]
+        )
+
 @app.get("/legacy/ohlcv")
-def get_ohlcv_legacy(
+async def get_ohlcv_legacy(
     symbol: str = Query(...),
     tf: str = Query(...),
     start: str = Query(...),
     end: str = Query(...)
 ):
-    """Legacy synchronous OHLCV endpoint (deprecated)."""
+    """Legacy OHLCV endpoint (deprecated); provider calls run on the provider pool."""
     try:
-        data = fetch_unified_ohclv(
-            symbol, tf, start, end,
-            api_key=settings.alpaca_api_key,
-            secret_key=settings.alpaca_secret_key
+        data = await single_flight(
+            ("legacy_ohlcv", symbol, tf, start, end),
+            lambda: fetch_unified_ohclv_async(
+                symbol, tf, start, end,
+                api_key=settings.alpaca_api_key,
+                secret_key=settings.alpaca_secret_key
+            )
         )
         if data is None:
             return {"error": "No data"}
         
-        opens, highs, lows, closes, volumes, times = data
-        return {
-            "symbol": symbol,
-            "timeframe": tf,
-            "data": [
-                {"time": str(times[i]), "open": opens[i], "high": highs[i], 
-                 "low": lows[i], "close": closes[i], "volume": volumes[i]}
-                for i in range(len(times))
-            ]
-        }
+        # Columnar batch -> records without a per-row Python loop, one chunk at a time
+        return StreamingResponse(
+            stream_records({"symbol": symbol, "timeframe": tf}, batch_record_chunks(data)),
+            media_type="application/json"
+        )
     except Exception as e:
         return {"error": str(e)}
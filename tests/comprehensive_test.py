@@ -1,6 +1,7 @@
 import os
 import sys
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
@@ -48,108 +49,123 @@ TEST_CASES = [
 
 results = []
 
-def run_tests():
-    print("Starting Comprehensive Tests...")
+def run_case(test, start_str, end_str):
+    """Run one TEST_CASES entry and return its report row."""
+    provider = test["provider"]
+    data_type = test["type"]
+    symbol = test["symbol"]
+    tf = test["tf"]
+    
+    print(f"Testing {provider} {data_type} for {symbol}...")
+    
+    status = "PASS"
+    error_msg = ""
+    data_summary = ""
     
-    for test in TEST_CASES:
-        provider = test["provider"]
-        data_type = test["type"]
-        symbol = test["symbol"]
-        tf = test["tf"]
-        days_back = test["days_back"]
-        
-        # End time 20 mins ago (UTC) to avoid Alpaca 15-min delay and timezone issues
-        end_dt = datetime.utcnow() - timedelta(minutes=20)
-        start_dt = end_dt - timedelta(days=days_back)
-        
-        # Format dates as expected by the fetchers (YYYY-MM-DD-HH-MM-SS)
-        start_str = start_dt.strftime("%Y-%m-%d-%H-%M-%S")
-        end_str = end_dt.strftime("%Y-%m-%d-%H-%M-%S")
-        
-        print(f"Testing {provider} {data_type} for {symbol}...")
-        
-        status = "PASS"
-        error_msg = ""
-        data_summary = ""
-        
-        try:
-            res = None
-            if data_type == "ohlcv":
-                if provider == "dukascopy":
-                    res = fetch_dukascopy_ohclv(symbol, tf, start_str, end_str)
-                elif provider == "binance":
-                    res = fetch_binance_ohclv(symbol, tf, start_str, end_str)
-                elif provider == "alpaca":
-                    res = fetch_alpaca_ohclv(symbol, tf, start_str, end_str, ALPACA_API_KEY, ALPACA_SECRET_KEY)
-                elif provider == "unified":
-                    res = fetch_unified_ohclv(symbol, tf, start_str, end_str, ALPACA_API_KEY, ALPACA_SECRET_KEY)
-                
-                if res:
-                    opens, highs, lows, closes, volumes, times = res
-                    data_summary = f"Rows: {len(times)}"
-                    if len(times) > 0:
-                        data_summary += f", First: {times[0]}, Last: {times[-1]}"
-                    else:
-                        status = "FAIL"
-                        error_msg = "Empty data returned"
+    try:
+        res = None
+        if data_type == "ohlcv":
+            if provider == "dukascopy":
+                res = fetch_dukascopy_ohclv(symbol, tf, start_str, end_str)
+            elif provider == "binance":
+                res = fetch_binance_ohclv(symbol, tf, start_str, end_str)
+            elif provider == "alpaca":
+                res = fetch_alpaca_ohclv(symbol, tf, start_str, end_str, ALPACA_API_KEY, ALPACA_SECRET_KEY)
+            elif provider == "unified":
+                res = fetch_unified_ohclv(symbol, tf, start_str, end_str, ALPACA_API_KEY, ALPACA_SECRET_KEY)
+            
+            if res:
+                times = res.times
+                data_summary = f"Rows: {len(times)}"
+                if len(times) > 0:
+                    data_summary += f", First: {times[0]}, Last: {times[-1]}"
                 else:
                     status = "FAIL"
-                    error_msg = "None returned"
-
-            elif data_type == "tick":
-                if provider == "dukascopy":
-                    res = fetch_dukascopy_ticks(symbol, tf, start_str, end_str)
-                elif provider == "binance":
-                    res = fetch_binance_ticks(symbol, tf, start_str, end_str)
-                elif provider == "alpaca":
-                    res = fetch_alpaca_ticks(symbol, tf, start_str, end_str, ALPACA_API_KEY, ALPACA_SECRET_KEY)
-                elif provider == "unified":
-                    prov_used, res = fetch_unified_tick(symbol, tf, start_str, end_str, ALPACA_API_KEY, ALPACA_SECRET_KEY)
-                    if prov_used:
-                         data_summary = f"Provider Used: {prov_used}. "
-                    else:
-                        status = "FAIL"
-                        error_msg = "Unified fetch failed to find provider"
-                        res = None
-
-                if res:
-                    b, a, bv, av, rv, t = res
-                    data_summary += f"Ticks: {len(t)}"
-                    if len(t) > 0:
-                         data_summary += f", First: {t[0]}, Last: {t[-1]}"
-                    else:
-                        status = "FAIL"
-                        error_msg = "Empty tick data"
-                elif status != "FAIL":
+                    error_msg = "Empty data returned"
+            else:
+                status = "FAIL"
+                error_msg = "None returned"
+
+        elif data_type == "tick":
+            if provider == "dukascopy":
+                res = fetch_dukascopy_ticks(symbol, tf, start_str, end_str)
+            elif provider == "binance":
+                res = fetch_binance_ticks(symbol, tf, start_str, end_str)
+            elif provider == "alpaca":
+                res = fetch_alpaca_ticks(symbol, tf, start_str, end_str, ALPACA_API_KEY, ALPACA_SECRET_KEY)
+            elif provider == "unified":
+                prov_used, res = fetch_unified_tick(symbol, tf, start_str, end_str, ALPACA_API_KEY, ALPACA_SECRET_KEY)
+                if prov_used:
+                     data_summary = f"Provider Used: {prov_used}. "
+                else:
+                    status = "FAIL"
+                    error_msg = "Unified fetch failed to find provider"
+                    res = None
+
+            if res:
+                t = res.times
+                data_summary += f"Ticks: {len(t)}"
+                if len(t) > 0:
+                     data_summary += f", First: {t[0]}, Last: {t[-1]}"
+                else:
                     status = "FAIL"
-                    error_msg = "None returned"
-
-        except Exception as e:
-            status = "FAIL"
-            error_msg = str(e)
-            # print(f"Error details: {e}")
-
-        results.append({
-            "provider": provider,
-            "type": data_type,
-            "symbol": symbol,
-            "tf": tf,
-            "status": status,
-            "details": error_msg if status == "FAIL" else data_summary
-        })
-        print(f"  -> {status} ({error_msg if status == 'FAIL' else data_summary})")
+                    error_msg = "Empty tick data"
+            elif status != "FAIL":
+                status = "FAIL"
+                error_msg = "None returned"
+
+    except Exception as e:
+        status = "FAIL"
+        error_msg = str(e)
+        # print(f"Error details: {e}")
+
+    print(f"  {provider} {data_type} {symbol} -> {status} ({error_msg if status == 'FAIL' else data_summary})")
+    return {
+        "provider": provider,
+        "type": data_type,
+        "symbol": symbol,
+        "tf": tf,
+        "status": status,
+        "details": error_msg if status == "FAIL" else data_summary
+    }
+
+def run_tests():
+    print("Starting Comprehensive Tests...")
+    
+    # End time 20 mins ago (UTC) to avoid Alpaca 15-min delay and timezone issues.
+    # Shared by every case; start strings are formatted once per days_back.
+    end_dt = datetime.utcnow() - timedelta(minutes=20)
+    # Format dates as expected by the fetchers (YYYY-MM-DD-HH-MM-SS)
+    end_str = f"{end_dt:%Y-%m-%d-%H-%M-%S}"
+    start_strs = {
+        days_back: f"{end_dt - timedelta(days=days_back):%Y-%m-%d-%H-%M-%S}"
+        for days_back in {test["days_back"] for test in TEST_CASES}
+    }
+    
+    # Cases are independent and network-bound, so run them all at once
+    with ThreadPoolExecutor(max_workers=len(TEST_CASES)) as ex:
+        results.extend(ex.map(
+            lambda test: run_case(test, start_strs[test["days_back"]], end_str),
+            TEST_CASES
+        ))
 
     generate_report()
 
 def generate_report():
     report_path = os.path.join(os.path.dirname(__file__), "test_report.md")
+    # Build the whole report in memory, then write it once
+    lines = [
+        "# Finda Comprehensive Test Report\n",
+        f"**Date:** {datetime.now():%Y-%m-%d %H:%M:%S}\n",
+        "| Provider | Type | Symbol | Timeframe | Status | Details |",
+        "|---|---|---|---|---|---|",
+    ]
+    lines += [
+        f"| {r['provider']} | {r['type']} | {r['symbol']} | {r['tf']} | {r['status']} | {r['details']} |"
+        for r in results
+    ]
     with open(report_path, "w") as f:
-        f.write("# Finda Comprehensive Test Report\n\n")
-        f.write(f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        f.write("| Provider | Type | Symbol | Timeframe | Status | Details |\n")
-        f.write("|---|---|---|---|---|---|\n")
-        for r in results:
-            f.write(f"| {r['provider']} | {r['type']} | {r['symbol']} | {r['tf']} | {r['status']} | {r['details']} |\n")
+        f.write("\n".join(lines) + "\n")
     
     print(f"\nReport generated at {report_path}")
 
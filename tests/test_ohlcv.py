@@ -1,4 +1,7 @@
-from finda.ohlcv_fetcher import fetch_unified_ohclv
+import asyncio
+import time
+
+from finda.ohlcv_fetcher import fetch_unified_ohclv_async
 
 API_KEY = "PKLNZTZ0TBT7WKZWSH4N"
 SECRET_KEY = "iCH07K5wDECSRRzGECU6VDua2L3oUD2QlDhG1Rd8"
@@ -22,17 +25,28 @@ test_cases = [
     ("QQQ", "day1", "2025-09-06-00-00-00", "2025-09-09-00-00-00"),
 ]
 
-for symbol, tf, start, end in test_cases:
-    print(f"\n=== OHLCV {symbol} | {tf} | {start} ~ {end} ===")
+async def run_one(symbol, tf, start, end):
+    # Collect output per case so concurrent cases don't interleave
+    lines = [f"\n=== OHLCV {symbol} | {tf} | {start} ~ {end} ==="]
+    t0 = time.perf_counter()
     try:
-        result = fetch_unified_ohclv(symbol, tf, start, end, API_KEY, SECRET_KEY)
+        result = await fetch_unified_ohclv_async(symbol, tf, start, end, API_KEY, SECRET_KEY)
         if result:
-            o, h, l, c, v, t = result
-            print(f"Bars: {len(o)}")
-            print(f"Open: {[round(x, 4) for x in o[:3]]}")
-            print(f"Volume: {v[:3]}")
-            print(f"Time: {t[:3]}")
+            o, h, l, c, v, t = result.as_lists()
+            lines.append(f"Bars: {len(o)}")
+            lines.append(f"Open: {[round(x, 4) for x in o[:3]]}")
+            lines.append(f"Volume: {v[:3]}")
+            lines.append(f"Time: {t[:3]}")
         else:
-            print("No data returned.")
+            lines.append("No data returned.")
     except Exception as e:
-        print(f"ERROR: {e}")
+        lines.append(f"ERROR: {e}")
+    lines.append(f"Elapsed: {time.perf_counter() - t0:.2f}s")
+    return lines
+
+async def main():
+    # Every case is network-bound: run them all at once, print in order
+    for lines in await asyncio.gather(*(run_one(*case) for case in test_cases)):
+        print("\n".join(lines))
+
+asyncio.run(main())
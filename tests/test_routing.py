@@ -0,0 +1,36 @@
+from finda.config import get_provider_order
+
+ALL = ("dukascopy", "binance", "alpaca")
+
+routes = {
+    # Crypto quoted in USDT - Binance, then Alpaca
+    "BTC/USDT": ("binance", "alpaca"),
+    "btcusdt": ("binance", "alpaca"),
+    # Fiat / metal pairs - Dukascopy only
+    "EUR/USD": ("dukascopy",),
+    "eurusd": ("dukascopy",),
+    "GBP/JPY": ("dukascopy",),
+    "XAU/USD": ("dukascopy",),
+    # US stocks - Alpaca only
+    "AAPL": ("alpaca",),
+    "msft": ("alpaca",),
+    "GOOGL": ("alpaca",),
+    # Crypto quoted in fiat, with or without a slash - every provider
+    "BTC/USD": ALL,
+    "SOL/USD": ALL,
+    "SOLUSD": ALL,
+    "DOGEUSD": ALL,
+    "XRPUSD": ALL,
+    "SOLUSDT": ALL,
+    "ETHUSD": ALL,
+    # Anything else - every provider
+    "BRK.B": ALL,
+}
+
+def test_provider_order():
+    for symbol, expected in routes.items():
+        assert get_provider_order(symbol) == expected, (symbol, get_provider_order(symbol))
+
+if __name__ == "__main__":
+    test_provider_order()
+    print(f"Routing OK ({len(routes)} symbols)")
@@ -1,3 +1,6 @@
+import asyncio
+import time
+
 from finda.tick_fetcher import fetch_dukascopy_ticks, fetch_binance_ticks, fetch_alpaca_ticks
 
 API_KEY = "PKLNZTZ0TBT7WKZWSH4N"
@@ -15,23 +18,27 @@ test_cases = [
     ("MSFT", "min1", "2025-09-08-08-00-00", "2025-09-08-09-35-00"),  # Monday pre-market
 ]
 
-for symbol, tf, start, end in test_cases:
-    print(f"\n=== TICK {symbol} | {start} ~ {end} ===")
-    # Dukascopy
-    try:
-        b, a, bv, av, v, t = fetch_dukascopy_ticks(symbol, tf, start, end)
-        print(f"Dukascopy ({symbol}) | Ticks: {len(b)}, Times: {t[:3]}")
-    except Exception as e:
-        print(f"Dukascopy ERROR: {e}")
-    # Binance
-    try:
-        b, a, bv, av, v, t = fetch_binance_ticks(symbol, tf, start, end)
-        print(f"Binance ({symbol}) | Ticks: {len(b)}, Times: {t[:3]}")
-    except Exception as e:
-        print(f"Binance ERROR: {e}")
-    # Alpaca
+async def run_provider(name, fetch, symbol, args):
+    t0 = time.perf_counter()
     try:
-        b, a, bv, av, v, t = fetch_alpaca_ticks(symbol, tf, start, end, API_KEY, SECRET_KEY)
-        print(f"Alpaca ({symbol}) | Ticks: {len(b)}, Times: {t[:3]}")
+        b, a, bv, av, v, t = (await asyncio.to_thread(fetch, *args)).as_lists()
+        line = f"{name} ({symbol}) | Ticks: {len(b)}, Times: {t[:3]}"
     except Exception as e:
-        print(f"Alpaca ERROR: {e}")
+        line = f"{name} ERROR: {e}"
+    return f"{line} [{time.perf_counter() - t0:.2f}s]"
+
+async def run_one(symbol, tf, start, end):
+    args = (symbol, tf, start, end)
+    lines = await asyncio.gather(
+        run_provider("Dukascopy", fetch_dukascopy_ticks, symbol, args),
+        run_provider("Binance", fetch_binance_ticks, symbol, args),
+        run_provider("Alpaca", fetch_alpaca_ticks, symbol, args + (API_KEY, SECRET_KEY)),
+    )
+    return [f"\n=== TICK {symbol} | {start} ~ {end} ===", *lines]
+
+async def main():
+    # Every case and provider is network-bound: run them all at once, print in order
+    for lines in await asyncio.gather(*(run_one(*case) for case in test_cases)):
+        print("\n".join(lines))
+
+asyncio.run(main())
@@ -1,6 +1,7 @@
 import os
 import sys
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 
@@ -24,6 +25,48 @@ ALPACA_SECRET_KEY = os.getenv("ALPACA_SECRET_KEY")
 
 print(f"Loaded Keys - Key: {'Found' if ALPACA_API_KEY else 'Missing'}")
 
+def run_case(t, start_str, end_str):
+    """Run one deep test and return its report row."""
+    print(f"Running: {t['name']}")
+    symbol = t['symbol']
+    tf = t['tf']
+    
+    status = "PASS"
+    details = ""
+    
+    try:
+        if tf == "tick":
+            prov, res = fetch_unified_tick(symbol, tf, start_str, end_str, ALPACA_API_KEY, ALPACA_SECRET_KEY)
+            if res:
+                times = res.times
+                details = f"Provider: {prov}, Ticks: {len(times)}"
+                if len(times) == 0:
+                    status = "FAIL"
+                    details = "Empty tick list"
+            else:
+                status = "FAIL"
+                details = "None returned"
+        else:
+            res = fetch_unified_ohclv(symbol, tf, start_str, end_str, ALPACA_API_KEY, ALPACA_SECRET_KEY)
+            if res:
+                times = res.times
+                details = f"Rows: {len(times)}"
+                if len(times) > 0:
+                    details += f", First: {times[0]}, Last: {times[-1]}"
+                else:
+                    status = "FAIL"
+                    details = "Empty OHLCV list"
+            else:
+                status = "FAIL"
+                details = "None returned"
+                
+    except Exception as e:
+        status = "FAIL"
+        details = str(e)
+    
+    print(f"  {t['name']} -> {status} ({details})")
+    return {"test": t['name'], "status": status, "details": details}
+
 def run_deep_tests():
     print("Starting Deep Unified Tests...")
     
@@ -41,63 +84,26 @@ def run_deep_tests():
         {"name": "Forex Tick (Dukascopy/Unified)", "symbol": "GBP/USD", "tf": "tick", "days": 0.01},
     ]
     
-    results = []
+    # Use UTC for Alpaca compatibility; one end time for the whole run
+    end_dt = datetime.now(timezone.utc) - timedelta(minutes=20)
+    end_str = f"{end_dt:%Y-%m-%d-%H-%M-%S}"
+    start_strs = {
+        days: f"{end_dt - timedelta(days=days):%Y-%m-%d-%H-%M-%S}"
+        for days in {t['days'] for t in tests}
+    }
     
-    for t in tests:
-        print(f"\nRunning: {t['name']}")
-        symbol = t['symbol']
-        tf = t['tf']
-        days = t['days']
-        
-        # Use UTC for Alpaca compatibility
-        end_dt = datetime.now(timezone.utc) - timedelta(minutes=20)
-        start_dt = end_dt - timedelta(days=days)
-        
-        start_str = start_dt.strftime("%Y-%m-%d-%H-%M-%S")
-        end_str = end_dt.strftime("%Y-%m-%d-%H-%M-%S")
-        
-        status = "PASS"
-        details = ""
-        
-        try:
-            if tf == "tick":
-                prov, res = fetch_unified_tick(symbol, tf, start_str, end_str, ALPACA_API_KEY, ALPACA_SECRET_KEY)
-                if res:
-                    b, a, bv, av, rv, times = res
-                    details = f"Provider: {prov}, Ticks: {len(times)}"
-                    if len(times) == 0:
-                        status = "FAIL"
-                        details = "Empty tick list"
-                else:
-                    status = "FAIL"
-                    details = "None returned"
-            else:
-                res = fetch_unified_ohclv(symbol, tf, start_str, end_str, ALPACA_API_KEY, ALPACA_SECRET_KEY)
-                if res:
-                    o, h, l, c, v, times = res
-                    details = f"Rows: {len(times)}"
-                    if len(times) > 0:
-                        details += f", First: {times[0]}, Last: {times[-1]}"
-                    else:
-                        status = "FAIL"
-                        details = "Empty OHLCV list"
-                else:
-                    status = "FAIL"
-                    details = "None returned"
-                    
-        except Exception as e:
-            status = "FAIL"
-            details = str(e)
-            
-        print(f"  -> {status} ({details})")
-        results.append({"test": t['name'], "status": status, "details": details})
+    # Tests are independent and network-bound, so run them all at once
+    with ThreadPoolExecutor(max_workers=len(tests)) as ex:
+        results = list(ex.map(
+            lambda t: run_case(t, start_strs[t['days']], end_str),
+            tests
+        ))
 
     # Generate Report
+    lines = ["# Deep Unified Test Report\n", "| Test | Status | Details |", "|---|---|---|"]
+    lines += [f"| {r['test']} | {r['status']} | {r['details']} |" for r in results]
     with open(os.path.join(os.path.dirname(__file__), "deep_test_report.md"), "w") as f:
-        f.write("# Deep Unified Test Report\n\n")
-        f.write("| Test | Status | Details |\n|---|---|---|\n")
-        for r in results:
-            f.write(f"| {r['test']} | {r['status']} | {r['details']} |\n")
+        f.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
     run_deep_tests()